@@ -20,6 +20,23 @@ def none_default(value, default):
 
 @dataclass(init=False)
 class Activity:
+    __slots__ = (
+        "name",
+        "sport",
+        "track",
+        "original_name",
+        "flags",
+        "effort_level",
+        "start_time",
+        "distance",
+        "activity_id",
+        "description",
+        "photos",
+        "server",
+        "username",
+        "cache",
+    )
+
     name: str
     sport: str
     track: track_.Track
@@ -50,6 +67,7 @@ def __init__(
         server=None,
         username=None,
     ):
+        self.cache = {}
         self.name = name
         self.sport = sport
         if isinstance(track, dict):
@@ -67,18 +85,21 @@ def __init__(
         self.effort_level = effort_level
         self.start_time = none_default(start_time, self.track.start_time)
         self.distance = none_default(distance, self.track.length)
-        self.activity_id = none_default(activity_id, uuid4())
+        # Only generate an ID for new activities
+        self.activity_id = uuid4() if activity_id is None else activity_id
         self.description = description
         self.photos = none_default(photos, [])
 
     @property
+    @track_.memoise
     def stats(self):
         result = {}
         result["Distance"] = DimensionValue(self.distance, "distance")
         result["Elapsed Time"] = DimensionValue(self.track.elapsed_time, "time")
         if not self.track.manual and self.track.moving_time < self.track.elapsed_time:
             result["Moving Time"] = DimensionValue(self.track.moving_time, "time")
-        if self.track.has_altitude_data:
+        has_altitude_data = self.track.has_altitude_data
+        if has_altitude_data:
             result["Ascent"] = DimensionValue(self.track.ascent, "altitude")
             result["Descent"] = DimensionValue(self.track.descent, "altitude")
         average_speed = self.track.average("speed")
@@ -97,7 +118,7 @@ def stats(self):
                 result["Pace (mov.)"] = DimensionValue(1 / average_speed_moving, "pace")
         if not self.track.manual:
             result["Max. Speed"] = DimensionValue(self.track.maximum("speed"), "speed")
-        if self.track.has_altitude_data:
+        if has_altitude_data:
             result["Highest Point"] = DimensionValue(
                 self.track.maximum("ele"), "altitude"
             )
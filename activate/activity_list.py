@@ -26,8 +26,22 @@ def from_disk(path):
         return ActivityList([], path)
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(init=False)
 class UnloadedActivity:
+    __slots__ = (
+        "name",
+        "sport",
+        "flags",
+        "effort_level",
+        "start_time",
+        "distance",
+        "duration",
+        "climb",
+        "activity_id",
+        "server",
+        "username",
+    )
+
     name: str
     sport: str
     flags: dict
@@ -37,8 +51,34 @@ class UnloadedActivity:
     duration: float
     climb: float
     activity_id: str
-    server: Optional[str] = None
-    username: Optional[str] = None
+    server: Optional[str]
+    username: Optional[str]
+
+    def __init__(
+        self,
+        name,
+        sport,
+        flags,
+        effort_level,
+        start_time,
+        distance,
+        duration,
+        climb,
+        activity_id,
+        server=None,
+        username=None,
+    ):
+        self.name = name
+        self.sport = sport
+        self.flags = flags
+        self.effort_level = effort_level
+        self.start_time = start_time
+        self.distance = distance
+        self.duration = duration
+        self.climb = climb
+        self.activity_id = activity_id
+        self.server = server
+        self.username = username
 
     def load(self, path) -> activity.Activity:
         """Get the corresponding loaded Activity from disk."""
@@ -65,11 +105,23 @@ def __init__(self, activities, path=None):
         self._activities = {}
         self.path = path
         super().__init__(activities)
+        self.reindex()
+
+    def reindex(self, start=0):
+        """Update the positions of activities from start onwards."""
+        if not start:
+            self.positions = {}
+        for position in range(start, len(self)):
+            self.positions[self[position].activity_id] = position
+
+    def append(self, activity_):
+        self.positions[activity_.activity_id] = len(self)
+        super().append(activity_)
 
     def by_id(self, activity_id):
         try:
-            return next(a for a in self if a.activity_id == activity_id)
-        except StopIteration as e:
+            return self[self.positions[activity_id]]
+        except KeyError as e:
             raise KeyError("No such activity_id") from e
 
     def provide_full_activity(self, activity_id, activity_):
@@ -87,7 +139,9 @@ def get_activity(self, activity_id):
         return self._activities[activity_id]
 
     def serialised(self):
-        return [dataclasses.asdict(a) for a in self]
+        # Shallow, unlike dataclasses.asdict, which deep-copies each field
+        fields = UnloadedActivity.__slots__
+        return [{f: getattr(a, f) for f in fields} for a in self]
 
     def save(self):
         """
@@ -112,17 +166,18 @@ def add_activity(self, new_activity):
 
     def update(self, activity_id):
         """Regenerate an unloaded activity from its loaded version."""
-        for i, unloaded_activity in enumerate(self):
-            if unloaded_activity.activity_id == activity_id:
-                self[i] = self._activities[activity_id].unload(UnloadedActivity)
-                break
+        if activity_id in self.positions:
+            self[self.positions[activity_id]] = self._activities[activity_id].unload(
+                UnloadedActivity
+            )
 
     def remove(self, activity_id):
         """Remove an activity from all parts of the ActivityList."""
         # Remove from main list
-        for a in self:
-            if a.activity_id == activity_id:
-                super().remove(a)
+        if activity_id in self.positions:
+            position = self.positions.pop(activity_id)
+            del self[position]
+            self.reindex(position)
         # Remove from loaded activities
         if activity_id in self._activities:
             del self._activities[activity_id]
@@ -138,41 +193,41 @@ def filtered(self, activity_types, time_period, now, back=0):
         previous, etc.
         """
         time_period = time_period.casefold()
+        if time_period == "all time":
+            return (a for a in self if a.sport in activity_types)
 
+        start, end = times.period_range(now, time_period, back)
         return (
-            a
-            for a in self
-            if a.sport in activity_types
-            and (
-                time_period == "all time"
-                or times.period_difference(now, a.start_time, time_period) == back
-            )
+            a for a in self if a.sport in activity_types and start <= a.start_time < end
         )
 
-    def total_distance(self, activities):
-        return sum(a.distance for a in activities)
-
-    def total_time(self, activities):
-        return sum((a.duration for a in activities), datetime.timedelta())
-
-    def total_activities(self, activities):
-        return sum(1 for _ in activities)
-
-    def total_climb(self, activities):
-        return sum(a.climb for a in activities if a.climb is not None)
+    def totals(self, activities) -> tuple:
+        """Get the total distance, time, number and climb of activities."""
+        distance = 0
+        time = datetime.timedelta()
+        count = 0
+        climb = 0
+        for activity_ in activities:
+            distance += activity_.distance
+            time += activity_.duration
+            count += 1
+            if activity_.climb is not None:
+                climb += activity_.climb
+        return distance, time, count, climb
 
     def eddington(self, activities, progress=lambda x: x) -> list:
         """Get a list of days sorted by distance done that day."""
-        return sorted(
-            sum(
-                (
-                    Counter(self.get_activity(a.activity_id).track.distance_in_days)
-                    for a in progress(activities)
-                ),
-                Counter(),
-            ).values(),
-            reverse=True,
-        )
+        days = Counter()
+        for activity_ in progress(activities):
+            start = activity_.start_time
+            # Activities within a single day don't need their tracks
+            if start.date() == (start + activity_.duration).date():
+                days[start.date()] += activity_.distance
+            else:
+                days.update(
+                    self.get_activity(activity_.activity_id).track.distance_in_days
+                )
+        return sorted((d for d in days.values() if d > 0), reverse=True)
 
     def get_progression_data(self, activity_types, time_period, now, key):
         """
@@ -135,13 +135,18 @@ def add_manual_activity(self):
 
     def update_activity_list(self):
         """Make the activity list show the correct activities."""
-        self.activity_list_table.setRowCount(len(self.activities))
-        for i, activity_ in enumerate(self.activities):
-            self.activity_list_table.set_id_row(
-                activity_.activity_id, activity_.list_row, i
-            )
-        self.activity_list_table.resizeColumnsToContents()
-        self.activity_list_table.default_sort()
+        self.activity_list_table.setUpdatesEnabled(False)
+        self.activity_list_table.setSortingEnabled(False)
+        try:
+            self.activity_list_table.setRowCount(len(self.activities))
+            for i, activity_ in enumerate(self.activities):
+                self.activity_list_table.set_id_row(
+                    activity_.activity_id, activity_.list_row, i
+                )
+            self.activity_list_table.resizeColumnsToContents()
+        finally:
+            self.activity_list_table.default_sort()
+            self.activity_list_table.setUpdatesEnabled(True)
 
     def add_activity(self, new_activity, position=0):
         """Add an activity to list."""
@@ -247,20 +252,26 @@ def import_activities(self):
         )[0]
         if not filenames:
             return
+        self.activity_list_table.setUpdatesEnabled(False)
         self.activity_list_table.setSortingEnabled(False)
-        for filename in activate.app.dialogs.progress(
-            self, filenames, "Importing Activities"
-        ):
-            filename = Path(filename)
-            try:
-                self.add_activity(load_activity.import_and_load(filename, paths.TRACKS))
-            except Exception as e:
-                alert_box = QtWidgets.QMessageBox()
-                alert_box.setText(f"Could not load {filename}:\n{e}")
-                alert_box.exec()
-
-        self.activity_list_table.setCurrentCell(0, 0)
-        self.activity_list_table.setSortingEnabled(True)
+        try:
+            for filename in activate.app.dialogs.progress(
+                self, filenames, "Importing Activities"
+            ):
+                filename = Path(filename)
+                try:
+                    self.add_activity(
+                        load_activity.import_and_load(filename, paths.TRACKS)
+                    )
+                except Exception as e:
+                    alert_box = QtWidgets.QMessageBox()
+                    alert_box.setText(f"Could not load {filename}:\n{e}")
+                    alert_box.exec()
+
+            self.activity_list_table.setCurrentCell(0, 0)
+        finally:
+            self.activity_list_table.setSortingEnabled(True)
+            self.activity_list_table.setUpdatesEnabled(True)
         self.main_tab_switch(self.main_tabs.currentIndex())
 
     def export_activity(self):
@@ -528,7 +539,7 @@ def filter_social_activities(self):
     def unit_system(self):
         system = units.UNIT_SYSTEMS[self.settings.unit_system]
         for dimension, unit in self.settings.custom_units.items():
-            unit = units.UNIT_NAMES[unit]
+            unit = units.get_unit_names()[unit]
             system.units[dimension] = unit
         return system
 
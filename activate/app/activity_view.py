@@ -63,7 +63,9 @@ def switch_to_summary(self):
         self.info_table.update_data(self.activity.stats)
         if self.activity.track.has_position_data:
             self.map_widget.setVisible(True)
-            self.map_widget.show_route(self.activity.track.lat_lon_list)
+            self.map_widget.show_route(
+                self.activity.track.lat_lon_list, self.activity.track.lat_lon_bounds
+            )
             self.show_map()
         else:
             self.map_widget.setVisible(False)
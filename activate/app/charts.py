@@ -232,13 +232,7 @@ def encode_data(self, data):
         """Convert data with a dimension to floats with correct units."""
         # Convert units
         data = zip(
-            *(
-                [
-                    None if x is None else self.unit_system.encode(x, unit)
-                    for x in series
-                ]
-                for series, unit in data
-            )
+            *(self.unit_system.encode_many(series, unit) for series, unit in data)
         )
         # Get rid of Nones
         return list(zip(*(p for p in data if None not in p)))
@@ -456,9 +450,7 @@ def encode_data(self, data):
         The output values are in the correct units for display on the
         chart.
         """
-        x_data = [self.unit_system.encode(x, data[0][1]) for x in data[0][0]]
-        y_data = [self.unit_system.encode(x, data[1][1]) for x in data[1][0]]
-        return (x_data, y_data)
+        return tuple(self.unit_system.encode_many(*series) for series in data)
 
     def update_axis(self, direction, ticks, minimum, maximum):
         """Resize the chart axes."""
@@ -104,6 +104,8 @@ def apply_to_activity(self, data):
         self.activity.track.start_time = data["Start Time"]
         self.activity.track.elapsed_time = data["Duration"]
         self.activity.track.ascent = data["Ascent"]
+        # The stats depend on the track
+        self.activity.cache.clear()
 
     def exec(self, activity):
         self.activity = activity
@@ -110,9 +110,13 @@ def resizeEvent(self, event):
         with suppress(AttributeError):
             self.fit_bounds(self.bounds)
 
-    def show_route(self, route: list):
-        """Display a list of points on the map."""
-        self.bounds = get_bounds(route)
+    def show_route(self, route: list, bounds=None):
+        """
+        Display a list of points on the map.
+
+        The bounds are found from the route if not given.
+        """
+        self.bounds = get_bounds(route) if bounds is None else bounds
         self.fit_bounds(self.bounds)
         if self.mode != "route":
             self.clear_route_lines()
@@ -218,9 +218,18 @@ def set_units(self, *args, **kwargs):
             [number_formats.list_format(h) for h in self.headings],
         )
         self.resize_to_contents()
-        self.resize_to_contents(vertical=True)
+        self.set_row_heights()
         self.horizontalHeader().setSectionResizeMode(0, QtWidgets.QHeaderView.Stretch)
 
+    def set_row_heights(self):
+        """
+        Give every row the style's default height.
+
+        Sizing rows to their contents measures every cell whenever the
+        table is laid out, which is very slow for long lists.
+        """
+        self.verticalHeader().setSectionResizeMode(QtWidgets.QHeaderView.Fixed)
+
     @property
     def current_activity_id(self):
         return self.selectedItems()[0].activity_id
@@ -267,6 +276,10 @@ class SocialActivityList(ActivityListTable):
     headings = ["Server", "User", "Name", "Type", "Start Time", "Distance"]
     dimensions = [None, None, None, None, None, "distance"]
 
+    def set_row_heights(self):
+        # Rows can list several servers and users, one per line
+        self.resize_to_contents(vertical=True)
+
     def filter_by_server(self, allowed):
         for row in range(len(self)):
             servers = self.item(row, 0).text().split("\n")
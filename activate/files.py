@@ -1,11 +1,17 @@
 """Functions for manipulating files."""
+import os
 import shutil
 from pathlib import Path
 
 
-def has_extension(filename: Path, extension: str) -> bool:
-    """Determine if a file path has a given extension."""
-    return filename.suffix.casefold() == "." + extension
+def has_extension(filename: Path, extension) -> bool:
+    """
+    Determine if a file path has a given extension.
+
+    The extension should be lowercase and include the dot, like
+    ".gpx". A tuple of extensions can be given to match any of them.
+    """
+    return str(filename).casefold().endswith(extension)
 
 
 def encode_name(filename: str, directory: Path) -> Path:
@@ -17,20 +23,22 @@ def encode_name(filename: str, directory: Path) -> Path:
     If the name already starts with an underscore, the bare name cannot
     be used, _foo_bar.gpx becomes _0__foo_bar.gpx, _1__foo_bar.gpx etc.
     """
-    current_filenames = set(directory.glob("*"))
+    try:
+        with os.scandir(directory) as entries:
+            current_filenames = {entry.name for entry in entries}
+    except FileNotFoundError:
+        current_filenames = set()
     # No-underscore, unique filename
-    if filename[0] != "_":
-        full_name = directory / filename
-        if full_name not in current_filenames:
-            return full_name
+    if filename[0] != "_" and filename not in current_filenames:
+        return directory / filename
 
     # Others
     i = 0
     while True:
-        full_name = directory / f"_{i}_{filename}"
+        new_name = f"_{i}_{filename}"
         i += 1
-        if full_name not in current_filenames:
-            return full_name
+        if new_name not in current_filenames:
+            return directory / new_name
 
 
 def decode_name(filename: str) -> str:
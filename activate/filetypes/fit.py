@@ -24,36 +24,45 @@
 }
 
 
+LENGTH_SWIM_MARKERS = {"sub_sport": "lap_swimming", "event": "length"}.items()
+
+
 def load(filename):
     """Load and parse a FIT file."""
     if filename.suffix == ".gz":
         with gzip.open(filename) as f:
-            fit = FitFile(f).messages
-    else:
-        fit = FitFile(str(filename)).messages
-    fit = list(fit)
-    for message in fit:
-        point = message.get_values()
-        if point.items() & {"sub_sport": "lap_swimming", "event": "length"}.items():
-            return parse_fit(filename, fit, LENGTH_SWIM_FIELDS)
-    return parse_fit(filename, fit, NORMAL_FIELDS)
+            return parse_fit(FitFile(f).get_messages())
+    return parse_fit(FitFile(str(filename)).get_messages())
 
 
-def parse_fit(filename, fit, available_fields):
-    """Extract the useful fields from a FIT file."""
+def parse_fit(messages):
+    """
+    Extract the useful fields from a stream of FIT messages.
+
+    The messages are only traversed once. The record values are kept
+    until the end, since the message showing that the file is a
+    length swim may come after them.
+    """
     sport = "unknown"
-    fields = {field: [] for field in available_fields}
-    for message in fit:
+    length_swim = False
+    points = []
+    for message in messages:
         point = message.get_values()
+        if not length_swim and point.items() & LENGTH_SWIM_MARKERS:
+            length_swim = True
         if message.mesg_type.name == "session":
             sport = point["sport"]
 
         elif message.mesg_type.name == "record":
-            for field in available_fields:
-                try:
-                    value = available_fields[field](point)
-                except Exception:
-                    value = None
-                fields[field].append(value)
+            points.append(point)
+    available_fields = LENGTH_SWIM_FIELDS if length_swim else NORMAL_FIELDS
+    fields = {field: [] for field in available_fields}
+    for point in points:
+        for field in available_fields:
+            try:
+                value = available_fields[field](point)
+            except Exception:
+                value = None
+            fields[field].append(value)
     fields = {field: fields[field] for field in fields if set(fields[field]) != {None}}
     return (None, sport, fields)
@@ -23,8 +23,13 @@ def get_tree(filename):
     return tree.getroot()
 
 
-def load_fields(points, fields):
-    """Extract the fields from a list of points activity file."""
+def load_fields(points, fields, conversions=None):
+    """
+    Extract the fields from a list of points activity file.
+
+    conversions maps field names to functions which convert the whole
+    list of raw values for that field at once.
+    """
     result = {field: [] for field in fields}
     for point in points:
         for field in fields:
@@ -34,4 +39,7 @@ def load_fields(points, fields):
             except Exception:
                 value = None
             result[field].append(value)
+    if conversions is not None:
+        for field, conversion in conversions.items():
+            result[field] = conversion(result[field])
     return {field: result[field] for field in result if set(result[field]) != {None}}
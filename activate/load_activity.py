@@ -1,4 +1,5 @@
 """Functions for loading activities from files."""
+from functools import lru_cache
 from pathlib import Path
 
 from activate import activity, files, filetypes, track
@@ -25,20 +26,30 @@
     "16": "Swim",
     "23": "Row",
 }
+# The names which can be searched for in an activity name
+INFERABLE_TYPE_NAMES = tuple(
+    (k, v) for k, v in ACTIVITY_TYPE_NAMES.items() if not k.isnumeric()
+)
+
+LOADERS = {
+    ".gpx": filetypes.gpx.load,
+    ".fit": filetypes.fit.load,
+    ".tcx": filetypes.tcx.load,
+}
 
 
+@lru_cache(1024)
 def convert_activity_type(activity_type: str, name) -> str:
     """Get the correct activity type from a raw one or by inference."""
     activity_type = activity_type.casefold()
     if activity_type in ACTIVITY_TYPE_NAMES:
         return ACTIVITY_TYPE_NAMES[activity_type]
-    if activity_type in {"unknown", "generic"}:
+    if activity_type in {"unknown", "generic"} and name is not None:
         # Infer activity type from name
-        for activity_type_name in ACTIVITY_TYPE_NAMES:
-            if activity_type_name.isnumeric():
-                continue
-            if name is not None and activity_type_name in name.casefold():
-                return ACTIVITY_TYPE_NAMES[activity_type_name]
+        name = name.casefold()
+        for activity_type_name, sport in INFERABLE_TYPE_NAMES:
+            if activity_type_name in name:
+                return sport
     return "Other"
 
 
@@ -53,14 +64,15 @@ def load(filename: Path) -> dict:
 
     Uses the appropriate track loader from the filetypes module.
     """
-    filetype = (
-        filename.with_suffix("").suffix
-        if filename.suffix.casefold() == ".gz"
-        else filename.suffix
-    ).casefold()
-    data = {".gpx": filetypes.gpx, ".fit": filetypes.fit, ".tcx": filetypes.tcx}[
-        filetype
-    ].load(filename)
+    name = filename.name.casefold()
+    if name.endswith(".gz"):
+        name = name[:-3]
+    filetype = name[name.rfind(".") :]
+    try:
+        loader = LOADERS[filetype]
+    except KeyError as e:
+        raise ValueError(f"Unknown file type: {filetype}") from e
+    data = loader(filename)
     return {
         "name": data[0] if data[0] is not None else default_name(filename),
         "sport": convert_activity_type(data[1], data[0]),
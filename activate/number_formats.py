@@ -21,43 +21,77 @@ def maybe_as_int(value) -> str:
     return str(value)
 
 
+def identity(value):
+    return value
+
+
+def start_time_format(value) -> str:
+    return str(times.round_time(value))
+
+
+TWO_DP = "{:.2f}".format
+ONE_DP = "{:.1f}".format
+
+INFO_FORMATS = {
+    "Average Speed": TWO_DP,
+    "Mov. Av. Speed": TWO_DP,
+    "Distance": TWO_DP,
+    "Max. Speed": ONE_DP,
+    "Average Power": ONE_DP,
+    "Average HR": ONE_DP,
+    "Avg. Cadence": ONE_DP,
+    "Ascent": as_int,
+    "Descent": as_int,
+    "Highest Point": as_int,
+    "Max. Power": as_int,
+    "Elapsed Time": times.to_string,
+    "Moving Time": times.to_string,
+    "Pace": times.to_string,
+    "Pace (mov.)": times.to_string,
+    None: identity,
+}
+
+SPLIT_FORMATS = {
+    "Number": as_int,
+    "Time": times.to_string,
+    "Split": times.to_string,
+    "Net Climb": as_int,
+    "Ascent": as_int,
+    "Speed": TWO_DP,
+}
+
+LIST_FORMATS = {
+    "Name": None,
+    "Type": None,
+    "Server": None,
+    "User": None,
+    "Distance": TWO_DP,
+    "Start Time": start_time_format,
+}
+
+
 def info_format(entry: str):
     """Format an value for the info box."""
-    if entry in {"Average Speed", "Mov. Av. Speed", "Distance"}:
-        return "{:.2f}".format
-    if entry in {"Max. Speed", "Average Power", "Average HR", "Avg. Cadence"}:
-        return "{:.1f}".format
-    if entry in {"Ascent", "Descent", "Highest Point", "Max. Power"}:
-        return as_int
-    if entry in {"Elapsed Time", "Moving Time", "Pace", "Pace (mov.)"}:
-        return times.to_string
-    if entry is None:
-        return lambda x: x
-    raise ValueError(f"Unknown entry: {entry}")
+    try:
+        return INFO_FORMATS[entry]
+    except KeyError as e:
+        raise ValueError(f"Unknown entry: {entry}") from e
 
 
 def split_format(entry: str):
     """Format a value for the splits table."""
-    if entry == "Number":
-        return as_int
-    if entry in {"Time", "Split"}:
-        return times.to_string
-    if entry in {"Net Climb", "Ascent"}:
-        return as_int
-    if entry == "Speed":
-        return "{:.2f}".format
-    raise ValueError(f"Unknown entry: {entry}")
+    try:
+        return SPLIT_FORMATS[entry]
+    except KeyError as e:
+        raise ValueError(f"Unknown entry: {entry}") from e
 
 
 def list_format(entry: str):
     """Format a value for the splits table."""
-    if entry in {"Name", "Type", "Server", "User"}:
-        return None
-    if entry == "Distance":
-        return "{:.2f}".format
-    if entry == "Start Time":
-        return lambda value: str(times.round_time(value))
-    raise ValueError(f"Unknown entry: {entry}")
+    try:
+        return LIST_FORMATS[entry]
+    except KeyError as e:
+        raise ValueError(f"Unknown entry: {entry}") from e
 
 
 def default_as_string(value) -> str:
@@ -9,6 +9,9 @@
 from datetime import datetime, timedelta
 from pathlib import Path
 
+# Much faster than the gzip module's default of 9, for ~1 % more space
+COMPRESS_LEVEL = 6
+
 
 def default(obj):
     """
@@ -42,11 +45,12 @@ def decode(obj):
     """Undo encoding done by default."""
     if len(obj) != 1:
         return obj
-    key, value = obj.popitem()
+    ((key, value),) = obj.items()
     try:
-        return DECODE_KEYS[key](value)
+        decoder = DECODE_KEYS[key]
     except KeyError:
-        return {key: value}
+        return obj
+    return decoder(value)
 
 
 def dumps(obj, readable=False):
@@ -62,7 +66,7 @@ def dumps(obj, readable=False):
 def dump_bytes(obj, gz=False, readable=False):
     """Convert an object to data."""
     data = dumps(obj, readable=readable).encode("utf-8")
-    return gzip.compress(data) if gz else data
+    return gzip.compress(data, COMPRESS_LEVEL) if gz else data
 
 
 def loads(data, gz=False):
@@ -71,14 +75,20 @@ def loads(data, gz=False):
     return json.loads(data, object_hook=decode)
 
 
-def dump(obj, filename, *args, **kwargs):
+def dump(obj, filename, gz=False, readable=False):
     """
     Save obj as a JSON file. Can store datetimes and timedeltas.
 
-    Can be gzipped if gz is True.
+    Can be gzipped if gz is True. The data is compressed straight into
+    the file, rather than into a separate bytes object first.
     """
-    with open(filename, "wb") as f:
-        f.write(dump_bytes(obj, *args, **kwargs))
+    data = dumps(obj, readable=readable).encode("utf-8")
+    if gz:
+        with gzip.open(filename, "wb", COMPRESS_LEVEL) as f:
+            f.write(data)
+    else:
+        with open(filename, "wb") as f:
+            f.write(data)
 
 
 def load(filename: Path, gz="auto"):
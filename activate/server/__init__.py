@@ -1,14 +1,16 @@
 import hashlib
+import hmac
 import json
 import sqlite3
+import time
 from base64 import b64decode, b64encode
 from datetime import timedelta
-from functools import wraps
+from functools import lru_cache, wraps
 from pathlib import Path
 from uuid import UUID
 
 import pkg_resources
-from flask import Flask, abort, g, request
+from flask import Flask, abort, g, request, send_file
 
 from activate import activity, serialise
 
@@ -23,6 +25,9 @@
 
 ACTIVITIES_DATABASE_PATH = DATA_DIR / "activities.sqlite"
 
+# How long (in seconds) a successful login is remembered for
+AUTH_CACHE_TIME = 60
+
 sqlite3.register_converter("DICT", serialise.loads)
 sqlite3.register_adapter(dict, serialise.dumps)
 
@@ -35,27 +40,50 @@
 sqlite3.register_adapter(UUID, str)
 
 
-def add_row(database, table: str, values: dict):
-    """Add a row to an SQLite database."""
-    database.execute(
-        f"INSERT INTO {table} ({', '.join(values)})"
-        f" VALUES ({', '.join(f':{v}' for v in values)})",
-        values,
-    )
+ACTIVITY_COLUMNS = (
+    "name",
+    "sport",
+    "flags",
+    "effort_level",
+    "start_time",
+    "distance",
+    "duration",
+    "climb",
+    "activity_id",
+    "username",
+)
+# Replaces any existing row with the same activity_id
+INSERT_ACTIVITY = (
+    f"INSERT OR REPLACE INTO activities ({', '.join(ACTIVITY_COLUMNS)})"
+    f" VALUES ({', '.join('?' for _ in ACTIVITY_COLUMNS)})"
+)
+
+
+@lru_cache(128)
+def select_statement(table: str, columns: tuple) -> str:
+    """Get an SQL statement finding rows with given column values."""
+    return f"SELECT * FROM {table} WHERE {' AND '.join(f'{c} = ?' for c in columns)}"
 
 
 def get_row(database, table: str, values: dict):
     """Find a row in an SQLite database."""
     return database.execute(
-        f"SELECT * FROM {table} WHERE {' AND '.join(f'{v} = :{v}' for v in values)}",
-        values,
+        select_statement(table, tuple(values)), tuple(values.values())
     ).fetchone()
 
 
-def delete_by_id(activities, activity_id):
-    """Delete a row with a given activity_id."""
-    activities.execute(
-        "DELETE FROM activities WHERE activity_id = ?", [str(activity_id)]
+def delete_by_id(activities, activity_id, username) -> bool:
+    """
+    Delete a row with a given activity_id, belonging to username.
+
+    Returns whether there was such a row.
+    """
+    return (
+        activities.execute(
+            "DELETE FROM activities WHERE activity_id = ? AND username = ?",
+            (str(activity_id), username),
+        ).rowcount
+        > 0
     )
 
 
@@ -74,6 +102,8 @@ def load_database():
         detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES,
     )
     db.row_factory = sqlite3.Row
+    db.execute("PRAGMA journal_mode=WAL")
+    db.execute("PRAGMA synchronous=NORMAL")
     return db
 
 
@@ -100,16 +130,63 @@ def get_users():
         return {}
 
 
-def save_users():
+def save_users(users):
+    """Write users to the users file and start using them."""
     with open(USERS_FILE, "w") as f:
-        json.dump(f, users)
+        json.dump(users, f)
+    user_cache.set_users(users, USERS_FILE.stat().st_mtime_ns)
+
+
+def get_credentials(users) -> dict:
+    """Get the decoded salt and password hash for each user."""
+    return {
+        username: (b64decode(user["salt"]), b64decode(user["password_hash"]))
+        for username, user in users.items()
+    }
+
+
+def raw_password_hash(password: bytes, salt: bytes) -> bytes:
+    return hashlib.scrypt(password, salt=salt, n=16384, r=8, p=1)
+
+
+class UserCache:
+    """The users and their credentials, reloaded when the file changes."""
+
+    def __init__(self):
+        self.mtime = None
+        self.users = {}
+        self.credentials = {}
+
+    def get_credentials(self) -> dict:
+        """Get the credentials, reloading them if necessary."""
+        try:
+            mtime = USERS_FILE.stat().st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+        if mtime != self.mtime:
+            self.mtime = mtime
+            self.users = get_users()
+            self.credentials = get_credentials(self.users)
+            # Passwords may have changed
+            verified.clear()
+        return self.credentials
+
+    def set_users(self, users, mtime):
+        """Use users, which were just saved, without reloading them."""
+        credentials = get_credentials(users)
+        # Forget logins for users whose passwords have changed
+        for key in [
+            k for k in verified if credentials.get(k[0]) != self.credentials.get(k[0])
+        ]:
+            del verified[key]
+        self.mtime = mtime
+        self.users = users
+        self.credentials = credentials
 
 
 def password_hash(password: str, salt):
     return b64encode(
-        hashlib.scrypt(
-            password.encode("utf-8"), salt=b64decode(salt), n=16384, r=8, p=1
-        )
+        raw_password_hash(password.encode("utf-8"), b64decode(salt))
     ).decode("utf-8")
 
 
@@ -118,13 +195,22 @@ def verify_request():
     if request.authorization is None:
         return False
     username = request.authorization["username"]
-    if username not in users:
+    credentials = user_cache.get_credentials()
+    if username not in credentials:
         return False
-    password = request.authorization["password"]
-    return (
-        password_hash(password, users[username]["salt"])
-        == users[username]["password_hash"]
-    )
+    password = request.authorization["password"].encode("utf-8")
+    # Avoid keeping plain-text passwords around
+    key = (username, hashlib.sha256(password).digest())
+    now = time.monotonic()
+    if verified.get(key, now) > now:
+        return True
+    salt, expected_hash = credentials[username]
+    if not hmac.compare_digest(raw_password_hash(password, salt), expected_hash):
+        return False
+    for old_key in [k for k, expiry in verified.items() if expiry <= now]:
+        del verified[old_key]
+    verified[key] = now + AUTH_CACHE_TIME
+    return True
 
 
 def requires_auth(function):
@@ -149,37 +235,32 @@ def upload():
     data["username"] = request.authorization["username"]
     new_activity = activity.Activity(**data)
     activities = get_activities()
-    delete_by_id(activities, new_activity.activity_id)
-    add_row(
-        activities,
-        "activities",
-        {
-            "name": new_activity.name,
-            "sport": new_activity.sport,
-            "flags": new_activity.flags,
-            "effort_level": new_activity.effort_level,
-            "start_time": new_activity.start_time,
-            "distance": new_activity.distance,
-            "duration": new_activity.track.elapsed_time,
-            "climb": new_activity.track.ascent,
-            "activity_id": new_activity.activity_id,
-            "username": new_activity.username,
-        },
+    activities.execute(
+        INSERT_ACTIVITY,
+        (
+            new_activity.name,
+            new_activity.sport,
+            new_activity.flags,
+            new_activity.effort_level,
+            new_activity.start_time,
+            new_activity.distance,
+            new_activity.track.elapsed_time,
+            new_activity.track.ascent,
+            new_activity.activity_id,
+            new_activity.username,
+        ),
     )
     new_activity.save(ACTIVITIES_DIR)
     activities.commit()
     return "DONE"
 
 
-@app.route("/api/delete_activity/<string:activity_id>")
+@app.route("/api/delete_activity/<uuid:activity_id>")
 @requires_auth
 def delete_activity(activity_id):
-    activity_id = UUID(activity_id)
     activities = get_activities()
-    row = get_row(activities, "activities", {"activity_id": activity_id})
-    if row["username"] != request.authorization["username"]:
+    if not delete_by_id(activities, activity_id, request.authorization["username"]):
         abort(403)
-    delete_by_id(activities, activity_id)
     activities.commit()
     return "DONE"
 
@@ -187,24 +268,44 @@ def delete_activity(activity_id):
 @app.route("/api/get_activities")
 @requires_auth
 def get_list():
-    activities = get_activities()
-    activities = activities.execute("SELECT * FROM activities").fetchall()
-    return serialise.dump_bytes([{k: a[k] for k in a.keys()} for a in activities])
-
-
-@app.route("/api/get_activity/<string:activity_id>")
+    def generate():
+        """
+        Yield the JSON list one row at a time.
+
+        This uses its own connection, since the one in g is closed at
+        the end of the request, before the response is streamed.
+        """
+        activities = load_database()
+        try:
+            rows = activities.execute("SELECT * FROM activities")
+            columns = [c[0] for c in rows.description]
+            separator = "["
+            for row in rows:
+                yield separator
+                yield serialise.dumps(dict(zip(columns, row)))
+                separator = ","
+            yield "[]" if separator == "[" else "]"
+        finally:
+            activities.close()
+
+    return app.response_class(generate(), mimetype="application/json")
+
+
+@app.route("/api/get_activity/<uuid:activity_id>")
 @requires_auth
 def get_activity(activity_id):
-    activity_id = UUID(activity_id)
     activities = get_activities()
-    try:
-        get_row(activities, "activities", {"activity_id": activity_id})
-    except FileNotFoundError:
+    if get_row(activities, "activities", {"activity_id": activity_id}) is None:
         abort(404)
-    with open(ACTIVITIES_DIR / f"{activity_id}.json.gz", "rb") as f:
-        return f.read()
+    return send_file(
+        ACTIVITIES_DIR / f"{activity_id}.json.gz",
+        mimetype="application/gzip",
+        conditional=True,
+    )
 
 
-users = get_users()
+# Maps (username, password digest) to the expiry time of the login
+verified = {}
+user_cache = UserCache()
 if not ACTIVITIES_DATABASE_PATH.exists():
     reset_activities()
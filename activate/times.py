@@ -1,5 +1,9 @@
 """Functions for dealing with datetimes and timedeltas."""
+import warnings
 from datetime import datetime, timedelta
+from functools import lru_cache
+
+import numpy as np
 
 ONE_WEEK = timedelta(days=7)
 ONE_DAY = timedelta(days=1)
@@ -31,32 +35,49 @@ def from_GPX(string):
     return datetime.fromisoformat(string.rstrip("Z"))
 
 
+def from_GPX_many(strings) -> list:
+    """
+    Load a list of times in GPX format.
+
+    The whole list is parsed at once by NumPy. If that is impossible
+    (for example because of a UTC offset), fall back to from_GPX for
+    each time. Invalid times become None.
+    """
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        try:
+            return np.array(
+                [None if s is None else s.rstrip("Z") for s in strings],
+                dtype="datetime64[us]",
+            ).tolist()
+        except (ValueError, UserWarning):
+            pass
+    result = []
+    for string in strings:
+        try:
+            result.append(from_GPX(string))
+        except ValueError:
+            result.append(None)
+    return result
+
+
 def to_string(time: timedelta, exact=False):
     """Convert a time to a nicely formatted string."""
-    result = []
-    started = False
-    if time.days:
-        result += [str(time.days), " d "]
-        time %= ONE_DAY
-        started = True
-    if time >= ONE_HOUR or started:
-        result += [f"{time // ONE_HOUR:0>2d}", ":"]
-        time %= ONE_HOUR
-        started = True
-    if time >= ONE_MINUTE or started:
-        result += [f"{time // ONE_MINUTE:0>2d}", ":"]
-        time %= ONE_MINUTE
-    secs = time.total_seconds()
-    if int(secs) == secs or not exact:
-        secs = int(secs)
-        result.append(f"{secs:0>2d}")
-    else:
-        result.append(f"{secs:0>.2f}")
-    # Only seconds
-    if len(result) == 1:
-        result.append(" s")
-
-    return "".join(result).lstrip("0").strip()
+    total = time.total_seconds()
+    fractional = exact and total != int(total)
+    if not fractional:
+        total = int(total)
+    minutes, seconds = divmod(total, 60)
+    hours, minutes = divmod(int(minutes), 60)
+    days, hours = divmod(hours, 24)
+    if not (days or hours or minutes):
+        return f"{seconds:.2f} s" if fractional else f"{seconds} s"
+    seconds = f"{seconds:05.2f}" if fractional else f"{seconds:02d}"
+    if days:
+        return f"{days} d {hours:02d}:{minutes:02d}:{seconds}"
+    if hours:
+        return f"{hours}:{minutes:02d}:{seconds}"
+    return f"{minutes}:{seconds}"
 
 
 def nice(time: datetime):
@@ -77,22 +98,75 @@ def to_number(value):
     return value
 
 
+def year_name(base, number):
+    return str(base.year - number)
+
+
+def month_name(base, number):
+    return MONTHS[(base.month - number - 1) % 12]
+
+
+def week_name(base, number):
+    date = base.date() - number * ONE_WEEK - timedelta(days=base.weekday())
+    return f"w/c {date:%d %b}"
+
+
+def day_name(base, number):
+    return str((base - ONE_DAY * number).day)
+
+
+def weekday_name(base, number):
+    return f"{base - ONE_DAY * number:%A}"
+
+
+PERIOD_NAMES = {
+    "year": year_name,
+    "month": month_name,
+    "week": week_name,
+    "day": day_name,
+    "weekday": weekday_name,
+}
+
+
+@lru_cache(1024)
 def back_name(base, period: str, number=0):
     """Get the name of a year, month or week number back."""
-    if period == "year":
-        return str(base.year - number)
-    if period == "month":
-        return MONTHS[(base.month - number - 1) % 12]
-    if period == "week":
-        date = base.date() - number * ONE_WEEK - timedelta(days=base.weekday())
-        return f"w/c {date:%d %b}"
-    if period == "day":
-        return str((base - ONE_DAY * number).day)
-    if period == "weekday":
-        return f"{base - ONE_DAY * number:%A}"
-    raise ValueError('period must be "year", "month" or "week"')
+    try:
+        name = PERIOD_NAMES[period]
+    except KeyError as e:
+        raise ValueError('period must be "year", "month" or "week"') from e
+    return name(base, number)
 
 
+def year_difference(base, other):
+    return base.year - other.year
+
+
+def month_difference(base, other):
+    return base.month - other.month + (base.year - other.year) * 12
+
+
+def week_difference(base, other):
+    value = (base.date() - other.date()).days // 7
+    if other.weekday() > base.weekday():
+        value += 1
+    return value
+
+
+def day_difference(base, other):
+    return (base.date() - other.date()).days
+
+
+PERIOD_DIFFERENCES = {
+    "year": year_difference,
+    "month": month_difference,
+    "week": week_difference,
+    "day": day_difference,
+    "weekday": day_difference,
+}
+
+
+@lru_cache(1024)
 def period_difference(base, other, period: str) -> int:
     """
     Determine the number of years/months/weeks between other and base.
@@ -100,18 +174,11 @@ def period_difference(base, other, period: str) -> int:
     Returns 0 if they are in the same week, 1 if other is in the
     previous week etc.
     """
-    if period == "year":
-        return base.year - other.year
-    if period == "month":
-        return base.month - other.month + (base.year - other.year) * 12
-    if period == "week":
-        value = (base.date() - other.date()).days // 7
-        if other.weekday() > base.weekday():
-            value += 1
-        return value
-    if "day" in period:
-        return (base.date() - other.date()).days
-    raise ValueError('period must be "year", "month" or "week"')
+    try:
+        difference = PERIOD_DIFFERENCES[period]
+    except KeyError as e:
+        raise ValueError('period must be "year", "month" or "week"') from e
+    return difference(base, other)
 
 
 def since_start(base, period: str) -> timedelta:
@@ -119,37 +186,84 @@ def since_start(base, period: str) -> timedelta:
     return base - start_of(base, period)
 
 
+def year_start(base):
+    return datetime(year=base.year, month=1, day=1)
+
+
+def month_start(base):
+    return datetime(year=base.year, month=base.month, day=1)
+
+
+def day_start(base):
+    return datetime(year=base.year, month=base.month, day=base.day)
+
+
+def week_start(base):
+    return day_start(base) - base.weekday() * ONE_DAY
+
+
+PERIOD_STARTS = {
+    "year": year_start,
+    "month": month_start,
+    "week": week_start,
+    "day": day_start,
+    "weekday": day_start,
+}
+
+
+@lru_cache(1024)
 def start_of(base, period: str) -> datetime:
     """Get the start of the current period."""
-    if period == "year":
-        return datetime(year=base.year, month=1, day=1)
-    if period == "month":
-        return datetime(year=base.year, month=base.month, day=1)
-    if period == "week":
-        return (
-            datetime(year=base.year, month=base.month, day=base.day)
-            - base.weekday() * ONE_DAY
-        )
-    if "day" in period:
-        return datetime(year=base.year, month=base.month, day=base.day)
-    raise ValueError('period must be "year", "month", "week" or "day"')
+    try:
+        start = PERIOD_STARTS[period]
+    except KeyError as e:
+        raise ValueError('period must be "year", "month", "week" or "day"') from e
+    return start(base)
+
+
+def year_end(base):
+    return datetime(year=base.year + 1, month=1, day=1)
+
+
+def month_end(base):
+    if base.month == 12:
+        return year_end(base)
+    return datetime(year=base.year, month=base.month + 1, day=1)
+
+
+def week_end(base):
+    return week_start(base + ONE_WEEK)
+
+
+def day_end(base):
+    return day_start(base + ONE_DAY)
+
+
+PERIOD_ENDS = {
+    "year": year_end,
+    "month": month_end,
+    "week": week_end,
+    "day": day_end,
+    "weekday": day_end,
+}
 
 
+@lru_cache(1024)
 def end_of(base, period: str) -> datetime:
     """Get the end of the current period."""
-    if period == "year":
-        return start_of(base.replace(year=base.year + 1), period)
-    if period == "month":
-        if base.month == 12:
-            return start_of(base.replace(year=base.year + 1, month=1), period)
-        return start_of(base.replace(month=base.month + 1), period)
-
-    if period == "week":
-        return start_of(base + ONE_WEEK, period)
-    if "day" in period:
-        return start_of(base + ONE_DAY, period)
-
-    raise ValueError('period must be "year", "month" or "week"')
+    try:
+        end = PERIOD_ENDS[period]
+    except KeyError as e:
+        raise ValueError('period must be "year", "month" or "week"') from e
+    return end(base)
+
+
+def period_range(base, period: str, number=0) -> tuple:
+    """Get the start and end of the period number periods before base."""
+    start = start_of(base, period)
+    for _ in range(number):
+        start = start_of(start - ONE_DAY, period)
+    return start, end_of(start, period)
 
 
 def hours_minutes_seconds(time: timedelta) -> tuple:
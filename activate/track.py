@@ -3,17 +3,25 @@
 from contextlib import suppress
 from dataclasses import asdict, dataclass
 from datetime import datetime, timedelta
-from functools import lru_cache
-from itertools import tee
+from functools import wraps
 import bisect
 
+import numpy as np
 from dtw import dtw
 
-from activate import geometry, times
+from activate import geometry
 from activate.units import DimensionValue
 
 SPEED_RANGE = 1
 
+ONE_MICROSECOND = timedelta(microseconds=1)
+ONE_DAY_SECONDS = 24 * 60 * 60
+
+# Tracks are resampled to this many points when matching
+MATCH_POINTS = 1000
+# The warping window is 1 / MATCH_BAND of the track length
+MATCH_BAND = 20
+
 FIELD_DIMENSIONS = {
     "lat": "latlon",
     "lon": "latlon",
@@ -47,62 +55,59 @@ def lerp(value1, value2, ratio):
     return value1 + ratio * (value2 - value1)
 
 
-def pairs(iterator):
-    """Return pairs of adjacent items."""
-    firsts, seconds = tee(iterator, 2)
-    next(seconds)
-    return zip(firsts, seconds)
-
-
 def infer_nones(data):
-    """Infer None values by linear interpolation."""
-    none_count = 0
-    last_good = None
-    for index, value in enumerate(data):
-        if value is None:
-            none_count += 1
-            continue
-        if none_count:
-            # Write back interpolated values
-            gap_size = none_count + 1
-            for write_back in range(1, gap_size):
-                # Nones at start
-                if last_good is None:
-                    data[index - write_back] = value
-                # Nones in middle
-                else:
-                    data[index - write_back] = lerp(
-                        value, last_good, write_back / gap_size
-                    )
-
-            none_count = 0
-        last_good = value
-    if not none_count:
+    """
+    Infer None values by linear interpolation.
+
+    Nones before the first or after the last value take that value. The
+    list is modified in place and returned.
+    """
+    if None not in data:
         return data
-    # Nones at end
-    if last_good is None:
+    first = next((v for v in data if v is not None), None)
+    if first is None:
         raise ValueError("Cannot interpolate from all Nones")
-    for write_back in range(none_count + 1):
-        data[index - write_back] = last_good
+    # Datetimes are interpolated as microseconds since the first value
+    is_time = isinstance(first, datetime)
+    if is_time:
+        values = np.array(
+            [np.nan if v is None else (v - first) / ONE_MICROSECOND for v in data]
+        )
+    else:
+        values = np.array(data, dtype=float)
+    good = ~np.isnan(values)
+    indices = np.arange(len(data))
+    missing = indices[~good]
+    inferred = np.interp(missing, indices[good], values[good]).tolist()
+    if is_time:
+        inferred = [first + timedelta(microseconds=v) for v in inferred]
+    for index, value in zip(missing.tolist(), inferred):
+        data[index] = value
     return data
 
 
-def get_nearby_indices(length, position, number=1) -> range:
-    """
-    Return numbers around position, with at most number either side.
+def to_list(array) -> list:
+    """Convert an array to a list, with None for non-finite values."""
+    return [v if math.isfinite(v) else None for v in array.tolist()]
 
-    If position is too close to 0 or length, the excess points are
-    removed.
+
+def memoise(method):
     """
-    return range(max(position - number, 0), min(position + number + 1, length))
+    Cache a method's results on the instance.
 
+    Unlike lru_cache, this does not keep instances alive.
+    """
 
-try:
-    from math import dist
-except ImportError:
+    @wraps(method)
+    def new_method(self, *args):
+        key = (method.__name__, args)
+        try:
+            return self.cache[key]
+        except KeyError:
+            result = self.cache[key] = method(self, *args)
+            return result
 
-    def dist(point1, point2):
-        return math.sqrt(sum((c1 - c2) ** 2 for c1, c2 in zip(point1, point2)))
+    return new_method
 
 
 def enumerate_from(list_, point):
@@ -152,6 +157,7 @@ class Track:
 
     def __init__(self, fields):
         self.fields = fields
+        self.cache = {}
         for essential in ("lat", "lon"):
             if essential in self.fields:
                 with suppress(ValueError):
@@ -176,16 +182,12 @@ def __getitem__(self, field):
                 self.calculate_dist()
             elif field == "speed":
                 self.calculate_speed()
-            elif field in {"climb", "desc"}:
-                self.calculate_climb_desc()
-            elif field == "height_change":
+            elif field in {"height_change", "climb", "desc"}:
                 self.calculate_height_change()
             elif field == "vertical_speed":
                 self.calculate_vertical_speed()
-            elif field == "gradient":
+            elif field in {"gradient", "angle"}:
                 self.calculate_gradient()
-            elif field == "angle":
-                self.calculate_angle()
         return self.fields[field]
 
     def __setitem__(self, field, value):
@@ -206,115 +208,95 @@ def __contains__(self, field):
         return field in self.fields
 
     @property
-    @lru_cache(128)
+    @memoise
     def temporal_resolution(self):
-        return min(y - x for x, y in pairs(self["time"])).total_seconds()
+        return float(np.diff(self.elapsed_seconds).min())
 
     @property
-    @lru_cache(128)
+    @memoise
+    def elapsed_seconds(self):
+        """Get the time of each point in seconds since the start."""
+        start_time = self.start_time
+        return np.array([(t - start_time).total_seconds() for t in self["time"]])
+
+    @property
+    @memoise
     def xyz(self):
-        return [
-            geometry.to_cartesian(*point)
-            for point in zip(self["lat"], self["lon"], self["ele"])
-        ]
+        """Get an (N, 3) array of cartesian coordinates."""
+        return np.column_stack(
+            geometry.to_cartesian_many(self["lat"], self["lon"], self["ele"])
+        )
 
     def calculate_dist_to_last(self):
         """Calculate distances between adjacent points."""
-        self.fields["dist_to_last"] = [None]
         if "dist" in self.fields:
-            for point in range(1, len(self)):
-                relevant = self.fields["dist"][point - 1 : point + 1]
-                self.fields["dist_to_last"].append(
-                    None if None in relevant else relevant[1] - relevant[0]
-                )
+            dists_to_last = np.diff(self.array("dist"))
         else:
-            self.fields["dist_to_last"] += [dist(*x) for x in pairs(self.xyz)]
-
-    def calculate_climb_desc(self):
-        self.fields["climb"] = [None]
-        self.fields["desc"] = [None]
-        for height_change in self["height_change"][1:]:
-            # Not using max in order to have integers instead of floats,
-            # since max(0, 0.0) is 0.0. It's common to have a height
-            # difference of 0.0 in tracks, because altimeters are not
-            # very sensitive.
-            self.fields["climb"].append(0 if height_change <= 0 else height_change)
-            self.fields["desc"].append(0 if height_change >= 0 else -height_change)
+            dists_to_last = np.linalg.norm(np.diff(self.xyz, axis=0), axis=1)
+        self.fields["dist_to_last"] = [None] + to_list(dists_to_last)
 
     def calculate_dist(self):
         """Calculate cumulative distances."""
-        total_dist = 0
-        new_dist = [0]
-        for dist in self["dist_to_last"][1:]:
-            total_dist += dist
-            new_dist.append(total_dist)
-        self.fields["dist"] = new_dist
+        self.fields["dist"] = [0] + np.cumsum(self.array("dist_to_last")[1:]).tolist()
 
     def calculate_speed(self):
-        """Calculate speeds at each point."""
-        speeds = []
-        for point_index in range(len(self)):
-            relevant_points = get_nearby_indices(
-                len(self), point_index, number=SPEED_RANGE
-            )
-            time_diff = (
-                self["time"][relevant_points[-1]] - self["time"][relevant_points[0]]
-            ).total_seconds()
-            distance = sum(
-                self["dist_to_last"][p]
-                for p in relevant_points[1:]
-                if self["dist_to_last"][p] is not None
-            )
-            if time_diff:
-                speeds.append(distance / time_diff)
-            elif speeds:
-                speeds.append(speeds[-1])
-            else:
-                speeds.append(0)
-        self["speed"] = speeds
+        """
+        Calculate speeds at each point.
+
+        Each speed is taken over the points up to SPEED_RANGE either
+        side. Where no time passes over those points, the previous
+        speed is repeated.
+        """
+        length = len(self)
+        indices = np.arange(length)
+        first = np.maximum(indices - SPEED_RANGE, 0)
+        last = np.minimum(indices + SPEED_RANGE, length - 1)
+        total_dist = np.cumsum(np.nan_to_num(self.array("dist_to_last")))
+        distance = total_dist[last] - total_dist[first]
+        time_diff = self.elapsed_seconds[last] - self.elapsed_seconds[first]
+        valid = time_diff != 0
+        speeds = np.zeros(length)
+        speeds[valid] = distance[valid] / time_diff[valid]
+        last_valid = np.maximum.accumulate(np.where(valid, indices, -1))
+        self["speed"] = np.where(last_valid >= 0, speeds[last_valid], 0).tolist()
 
     def calculate_height_change(self):
-        """Calculate differences in elevation between adjacent points."""
-        self.fields["height_change"] = [None] + [y - x for x, y in pairs(self["ele"])]
+        """Calculate elevation changes, climb and descent at each point."""
+        height_changes = np.diff(self.array("ele"))
+        self.fields["height_change"] = [None] + to_list(height_changes)
+        self.fields["climb"] = [None] + to_list(np.maximum(height_changes, 0))
+        self.fields["desc"] = [None] + to_list(np.maximum(-height_changes, 0))
 
     def calculate_vertical_speed(self):
         """Calculate vertical speed at each point."""
-        self.fields["vertical_speed"] = [None]
-        for point in range(1, len(self)):
-            height_change = self["height_change"][point]
-            time = self["time"][point]
-            last_time = self["time"][point - 1]
-            if None in {height_change, time, last_time}:
-                self.fields["vertical_speed"].append(None)
-            else:
-                self.fields["vertical_speed"].append(
-                    height_change / (time - last_time).total_seconds()
-                )
-
-    def calculate_gradient(self):
-        """Calculate the gradient at each point."""
-        self.fields["gradient"] = [None]
-        for dist, height_change in list(
-            zip(self["dist_to_last"], self["height_change"])
-        )[1:]:
-            self.fields["gradient"].append(
-                None if dist in {None, 0} else height_change / dist
+        with np.errstate(divide="ignore", invalid="ignore"):
+            vertical_speeds = self.array("height_change")[1:] / np.diff(
+                self.elapsed_seconds
             )
+        self.fields["vertical_speed"] = [None] + to_list(vertical_speeds)
 
-    def calculate_angle(self):
-        """Calculate the angle of inclination at each point."""
-        self.fields["angle"] = [
-            None if g is None else math.atan(g) for g in self["gradient"]
-        ]
+    def calculate_gradient(self):
+        """Calculate the gradient and angle of inclination at each point."""
+        dists = self.array("dist_to_last")[1:]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            gradients = np.diff(self.array("ele")) / dists
+        gradients[dists == 0] = np.nan
+        self.fields["gradient"] = [None] + to_list(gradients)
+        self.fields["angle"] = [None] + to_list(np.arctan(gradients))
 
     def __len__(self):
         return len(next(iter(self.fields.values())))
 
-    @lru_cache(128)
+    @memoise
+    def array(self, field):
+        """Get a numerical field as an array, with NaN for missing values."""
+        return np.array(self[field], dtype=float)
+
+    @memoise
     def without_nones(self, field):
         return [v for v in self[field] if v is not None]
 
-    @lru_cache(128)
+    @memoise
     def average(self, field):
         """Get the mean value of a field, ignoring missing values."""
         if field == "speed":
@@ -323,27 +305,37 @@ def average(self, field):
         valid = list(self.without_nones(field))
         return sum(valid) / len(valid)
 
-    @lru_cache(128)
+    @memoise
     def maximum(self, field):
         """Get the maximum value of a field, ignoring missing values."""
         return max(self.without_nones(field))
 
     # Caching necessary to avoid fake elevation data
     @property
-    @lru_cache(128)
+    @memoise
     def has_altitude_data(self):
         return "ele" in self.fields
 
     @property
-    @lru_cache(128)
+    @memoise
     def has_position_data(self):
         return "lat" in self.fields and "lon" in self.fields
 
     @property
-    @lru_cache(128)
+    @memoise
     def lat_lon_list(self):
         return [[x, y] for x, y in zip(self["lat"], self["lon"])]
 
+    @property
+    @memoise
+    def lat_lon_bounds(self):
+        """Get [[south, west], [north, east]], as maps.get_bounds does."""
+        lat_lon = np.column_stack((self.array("lat"), self.array("lon")))
+        return [
+            np.nanmin(lat_lon, axis=0).tolist(),
+            np.nanmax(lat_lon, axis=0).tolist(),
+        ]
+
     def part_lat_lon_list(self, min_dist, max_dist):
         track = []
         for dist, lat, lon in zip(self["dist"], self["lat"], self["lon"]):
@@ -356,13 +348,13 @@ def part_lat_lon_list(self, min_dist, max_dist):
         return track
 
     @property
-    @lru_cache(128)
+    @memoise
     def ascent(self):
         if self.has_altitude_data:
             return sum(self.without_nones("climb"))
 
     @property
-    @lru_cache(128)
+    @memoise
     def descent(self):
         if self.has_altitude_data:
             return sum(self.without_nones("desc"))
@@ -372,18 +364,18 @@ def start_time(self):
         return self["time"][0]
 
     @property
-    @lru_cache(128)
+    @memoise
     def elapsed_time(self) -> timedelta:
         end_time = self["time"][-1]
         return end_time - self.start_time
 
     @property
-    @lru_cache(128)
+    @memoise
     def moving_time(self) -> timedelta:
-        total_time = timedelta(0)
+        total_time = 0
         last_distance = 0
-        last_time = self.start_time
-        for distance, time in zip(self["dist"][1:], self["time"][1:]):
+        last_time = 0
+        for distance, time in zip(self["dist"][1:], self.elapsed_seconds[1:].tolist()):
             if distance is None:
                 continue
             time_difference = time - last_time
@@ -392,50 +384,56 @@ def moving_time(self) -> timedelta:
             distance_difference = distance - last_distance
             if distance_difference < 1:
                 continue
-            if distance_difference / time_difference.total_seconds() > 0.2:
+            if distance_difference / time_difference > 0.2:
                 total_time += time_difference
             elif distance < last_distance:
                 raise ValueError("Distance increase")
             last_distance = distance
             last_time = time
 
-        return total_time
+        return timedelta(seconds=total_time)
 
     @property
-    @lru_cache(128)
+    @memoise
     def average_speed_moving(self):
         return self.length / self.moving_time.total_seconds()
 
     @property
-    @lru_cache(128)
+    @memoise
     def distance_in_days(self) -> dict:
         if self.start_time.date() == self["time"][-1].date():
             return {self.start_time.date(): self.length}
-        last_time = self.start_time
-        last_date = last_time.date()
-        totals = {last_date: 0}
+        start_date = self.start_time.date()
+        day_count = (self["time"][-1].date() - start_date).days + 1
+        midnight = datetime.combine(start_date, datetime.min.time())
+        # Elapsed seconds at the end of each day
+        day_ends = np.arange(1, day_count + 1) * ONE_DAY_SECONDS - (
+            (self.start_time - midnight).total_seconds()
+        )
 
-        for dist_to_last, time in zip(self["dist_to_last"][1:], self["time"][1:]):
-            if dist_to_last is None:
-                continue
-            date = time.date()
-            if date == last_date:
-                totals[last_date] += dist_to_last
-            else:
-                speed = dist_to_last / (time - last_time).total_seconds()
-                totals[last_date] += (
-                    speed * (times.end_of(last_time, "day") - last_time).total_seconds()
-                )
-                for days in range(1, (date - last_date).days):
-                    day = last_date + timedelta(days)
-                    totals[day] = speed * timedelta(days=1)
-                totals[date] = (
-                    speed * (time - times.start_of(time, "day")).total_seconds()
-                )
-                last_date = date
+        dists_to_last = self.array("dist_to_last")
+        # Points with a distance, each measured from the previous one
+        points = np.concatenate(([0], np.flatnonzero(~np.isnan(dists_to_last[1:])) + 1))
+        seconds = self.elapsed_seconds[points]
+        days = np.searchsorted(day_ends, seconds, side="right")
+        dists_to_last = dists_to_last[points[1:]]
+
+        totals = np.zeros(day_count)
+        same_day = days[1:] == days[:-1]
+        np.add.at(totals, days[1:][same_day], dists_to_last[same_day])
+        # Share distances spanning midnight between the days
+        for index in np.flatnonzero(~same_day):
+            first_day, last_day = days[index], days[index + 1]
+            last_time, time = seconds[index], seconds[index + 1]
+            speed = dists_to_last[index] / (time - last_time)
+            totals[first_day] += speed * (day_ends[first_day] - last_time)
+            totals[first_day + 1 : last_day] += speed * ONE_DAY_SECONDS
+            totals[last_day] += speed * (time - day_ends[last_day - 1])
 
-            last_time = time
-        return totals
+        return {
+            start_date + timedelta(day): total
+            for day, total in enumerate(totals[: days[-1] + 1].tolist())
+        }
 
     def lat_lng_from_distance(self, distance):
         distances = self.without_nones("dist")
@@ -466,6 +464,7 @@ def graph(self, y_data, x_data="dist") -> tuple:
         )
 
     @property
+    @memoise
     def length(self):
         return next(x for x in reversed(self["dist"]) if x is not None)
 
@@ -515,59 +514,59 @@ def get_zone_durations(self, zones, field="speed", count_field="time"):
         by that pair of zones values. The zones must be sorted in
         ascending order.
         """
-        buckets = {z: 0 for z in zones}
-        for point in range(len(self)):
-            # Work out the amount of count_field at the point
-            nearby_points = get_nearby_indices(len(self), point)
-            duration = (
-                self[count_field][nearby_points[-1]]
-                - self[count_field][nearby_points[0]]
-            ) / 2
-            duration = times.to_number(duration)
-
-            # Add it to the correct bucket
-            value = self[field][point]
-            if value is None:
-                continue
-            for zone in zones[::-1]:
-                if value > zone:
-                    buckets[zone] += duration
-                    break
-
-        return buckets
+        length = len(self)
+        indices = np.arange(length)
+        counts = (
+            self.elapsed_seconds if count_field == "time" else self.array(count_field)
+        )
+        # Half the amount of count_field between the neighbouring points
+        durations = (
+            counts[np.minimum(indices + 1, length - 1)]
+            - counts[np.maximum(indices - 1, 0)]
+        ) / 2
+
+        values = self.array(field)
+        # The last zone below each value
+        zone_indices = np.searchsorted(zones, values) - 1
+        counted = ~np.isnan(values) & (zone_indices >= 0)
+        totals = np.zeros(len(zones))
+        np.add.at(totals, zone_indices[counted], durations[counted])
+        return dict(zip(zones, totals.tolist()))
 
     def get_curve(self, table_distances):
         """Get the curve and curve table for an activity."""
-        table_distances = [x for x in table_distances if x <= self.length][::-1]
-        time_values = [t.timestamp() for t in self["time"]]
+        table_distances = [x for x in table_distances if x < self.length][::-1]
+        all_dists = self.array("dist")
+        positions = np.flatnonzero(~np.isnan(all_dists))
+        # Guard against the distance decreasing in bad data
+        dists = np.maximum.accumulate(all_dists[positions])
+        seconds = self.elapsed_seconds
 
         bests = []
         point_indices = []
         for distance in table_distances:
-            last_point = next(
-                i for i, d in enumerate(self["dist"]) if d is not None and d > distance
+            # The first window is from the start to the first point
+            # beyond distance
+            start = np.searchsorted(dists, distance, side="right")
+            lasts = np.arange(start + 1, len(dists))
+            # For each later point, the latest point at least distance
+            # before it (or the start if there is none)
+            firsts = np.searchsorted(dists, dists[lasts] - distance, side="right") - 1
+            first_points = np.where(firsts >= 0, positions[firsts], 0)
+            last_points = positions[lasts]
+            times_taken = np.concatenate(
+                (
+                    [seconds[positions[start]]],
+                    seconds[last_points] - seconds[first_points],
+                )
             )
-            best = time_values[last_point] - self.start_time.timestamp()
-            first_point = 0
-            point = (first_point, last_point)
-            for last_point, last_dist in enumerate_from(self["dist"], last_point + 1):
-                if last_dist is None:
-                    continue
-                last_good_first_point = first_point
-                for first_point, first_dist in enumerate_from(
-                    self["dist"], first_point
-                ):
-                    if first_dist is None:
-                        continue
-                    if last_dist - first_dist >= distance:
-                        last_good_first_point = first_point
-                    else:
-                        break
-                first_point = last_good_first_point
-                time_taken = time_values[last_point] - time_values[first_point]
-                if time_taken < best:
-                    best = time_taken
-                    point = (first_point, last_point)
+            # The earliest of the quickest windows
+            index = int(np.argmin(times_taken))
+            best = float(times_taken[index])
+            if index == 0:
+                point = (0, int(positions[start]))
+            else:
+                point = (int(first_points[index - 1]), int(last_points[index - 1]))
             bests.append(best)
             point_indices.append(point)
             if best == self.temporal_resolution:
@@ -598,9 +597,30 @@ def get_curve(self, table_distances):
             point_indices,
         )
 
+    @property
+    @memoise
+    def match_points(self):
+        """Get cartesian points evenly spaced by distance, for matching."""
+        dists = np.cumsum(np.nan_to_num(self.array("dist_to_last")))
+        targets = np.linspace(0, dists[-1], MATCH_POINTS)
+        return np.column_stack([np.interp(targets, dists, axis) for axis in self.xyz.T])
+
     def match(self, other, tolerance=40):
+        """
+        Check if two tracks follow the same route.
+
+        The tracks are resampled by distance, so the warping path stays
+        near the diagonal and only a band around it is searched.
+        """
         return (
-            dtw(self.xyz, other.xyz, distance_only=True).normalizedDistance < tolerance
+            dtw(
+                self.match_points,
+                other.match_points,
+                distance_only=True,
+                window_type="sakoechiba",
+                window_args={"window_size": MATCH_POINTS // MATCH_BAND},
+            ).normalizedDistance
+            < tolerance
         )
 
     def max_point(self, stat):
@@ -2,29 +2,36 @@
 import math
 from dataclasses import dataclass
 from datetime import timedelta
-from functools import wraps
-from typing import Union
+from functools import lru_cache
+from typing import NamedTuple, Union
 
 
-class DimensionError(Exception):
+class DimensionError(TypeError):
     pass
 
 
-def compatible_dimensions(function):
-    @wraps(function)
-    def wrapper(var1, var2, **kwargs):
-        if var1.dimension != var2.dimension:
-            raise DimensionError(
-                f"incompatible dimensions: {var1.dimension} and {var2.dimension}"
-            )
-        return function(var1, var2, **kwargs)
+def incompatible_dimensions(var1, var2):
+    return DimensionError(
+        f"incompatible dimensions: {var1.dimension} and {var2.dimension}"
+    )
+
 
-    return wrapper
+class DimensionValue(NamedTuple):
+    """
+    A value with a dimension attached.
 
+    Comparing or combining values of different dimensions raises a
+    DimensionError. Values are never equal to plain tuples.
 
-@dataclass(frozen=True)
-class DimensionValue:
-    """A value with a dimension attached."""
+    >>> DimensionValue(1, "time") == DimensionValue(1, "time")
+    True
+    >>> DimensionValue(1, "time") == (1, "time")
+    False
+    >>> DimensionValue(1, "time") == DimensionValue(1, "distance")
+    Traceback (most recent call last):
+    ...
+    activate.units.DimensionError: incompatible dimensions: time and distance
+    """
 
     value: Union[float, timedelta]
     dimension: str
@@ -35,41 +42,63 @@ def format(self, unit_system):
     def encode(self, unit_system):
         return unit_system.encode(self.value, self.dimension)
 
-    @compatible_dimensions
-    def __lt__(self, other):
-        return self.value < other.value
-
-    @compatible_dimensions
-    def __gt__(self, other):
-        return self.value > other.value
-
-    @compatible_dimensions
+    # Returning NotImplemented would fall back to tuple comparison
     def __eq__(self, other):
+        if not isinstance(other, DimensionValue):
+            return False
+        if self.dimension != other.dimension:
+            raise incompatible_dimensions(self, other)
         return self.value == other.value
 
-    @compatible_dimensions
     def __ne__(self, other):
+        if not isinstance(other, DimensionValue):
+            return True
+        if self.dimension != other.dimension:
+            raise incompatible_dimensions(self, other)
         return self.value != other.value
 
-    @compatible_dimensions
+    # Equal values have equal dimensions, so the tuple hash is consistent
+    __hash__ = tuple.__hash__
+
+    def __lt__(self, other):
+        if self.dimension != other.dimension:
+            raise incompatible_dimensions(self, other)
+        return self.value < other.value
+
+    def __gt__(self, other):
+        if self.dimension != other.dimension:
+            raise incompatible_dimensions(self, other)
+        return self.value > other.value
+
     def __le__(self, other):
+        if self.dimension != other.dimension:
+            raise incompatible_dimensions(self, other)
         return self.value <= other.value
 
-    @compatible_dimensions
     def __ge__(self, other):
+        if self.dimension != other.dimension:
+            raise incompatible_dimensions(self, other)
         return self.value >= other.value
 
-    @compatible_dimensions
     def __add__(self, other):
+        if self.dimension != other.dimension:
+            raise incompatible_dimensions(self, other)
         return DimensionValue(self.value + other.value, self.dimension)
 
-    @compatible_dimensions
     def __sub__(self, other):
+        if self.dimension != other.dimension:
+            raise incompatible_dimensions(self, other)
         return DimensionValue(self.value - other.value, self.dimension)
 
     def __neg__(self):
         return DimensionValue(-self.value, self.dimension)
 
+    # Stop tuple repetition
+    def __mul__(self, other):
+        return NotImplemented
+
+    __rmul__ = __mul__
+
 
 @dataclass
 class Unit:
@@ -110,6 +139,11 @@ class UnitConfig:
     def encode(self, value, dimension):
         return self.units[dimension].encode(value)
 
+    def encode_many(self, values, dimension) -> list:
+        """Encode a sequence of values, leaving any Nones alone."""
+        encode = self.units[dimension].encode
+        return [None if value is None else encode(value) for value in values]
+
     def decode(self, value, dimension):
         return self.units[dimension].decode(value)
 
@@ -238,33 +272,37 @@ def format(self, value):
 
 UNIT_SYSTEMS = {"Metric": UnitConfig(METRIC), "Imperial": UnitConfig(IMPERIAL)}
 
-UNIT_NAMES = {
-    u.name: u
-    for u in (
-        KM,
-        MILE,
-        METRE,
-        FOOT,
-        YARD,
-        SECOND,
-        MINUTE,
-        HOUR,
-        METRE_PER_SECOND,
-        KM_PER_HOUR,
-        MILE_PER_HOUR,
-        FOOT_PER_MINUTE,
-        METRE_PER_MINUTE,
-        TIME,
-        MIN_PER_KM,
-        MIN_PER_MILE,
-        BEAT_PER_MINUTE,
-        CYCLES_PER_MINUTE,
-        HERTZ,
-        WATT,
-        HORSE_POWER,
-        DEGREE,
-        RADIAN,
-        UNITLESS,
-        DATE,
-    )
-}
+
+@lru_cache(None)
+def get_unit_names() -> dict:
+    """Get a dictionary mapping unit names to units."""
+    return {
+        u.name: u
+        for u in (
+            KM,
+            MILE,
+            METRE,
+            FOOT,
+            YARD,
+            SECOND,
+            MINUTE,
+            HOUR,
+            METRE_PER_SECOND,
+            KM_PER_HOUR,
+            MILE_PER_HOUR,
+            FOOT_PER_MINUTE,
+            METRE_PER_MINUTE,
+            TIME,
+            MIN_PER_KM,
+            MIN_PER_MILE,
+            BEAT_PER_MINUTE,
+            CYCLES_PER_MINUTE,
+            HERTZ,
+            WATT,
+            HORSE_POWER,
+            DEGREE,
+            RADIAN,
+            UNITLESS,
+            DATE,
+        )
+    }